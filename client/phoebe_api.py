@@ -1,7 +1,10 @@
 """Phoebe API client for communicating with Phoebe sessions."""
 
+import threading
+from contextlib import contextmanager
+
 import requests
-from common.serialization import make_json_serializable
+from common.serialization import make_json_serializable, decode_arrays
 
 
 class PhoebeAPI:
@@ -11,6 +14,12 @@ class PhoebeAPI:
         self.base_url = base_url
         self.client_id = client_id
 
+        # per-thread queue of commands collected by batch():
+        self._batch = threading.local()
+
+        # keep-alive connections, reused by all commands:
+        self.session = requests.Session()
+
     def set_client_id(self, client_id: str):
         """Set the client ID for this API instance."""
         self.client_id = client_id
@@ -20,13 +29,55 @@ class PhoebeAPI:
         if not self.client_id:
             raise ValueError("No client ID set. Call set_client_id() first or provide client_id in constructor.")
 
+        queue = getattr(self._batch, 'queue', None)
+        if queue is not None:
+            queue.append(command)
+            return {'success': True, 'result': None, 'queued': True}
+
         # Serialize the command to ensure JSON compatibility
         serializable_command = make_json_serializable(command)
 
-        response = requests.post(f"{self.base_url}/send/{self.client_id}", json=serializable_command)
+        response = self.session.post(f"{self.base_url}/send/{self.client_id}", json=serializable_command)
         response.raise_for_status()
         return response.json()
 
+    @contextmanager
+    def batch(self):
+        """Send all commands issued in this block as a single request.
+
+        Commands issued inside the block (from the same thread) are queued
+        and return a placeholder response; on exit they are sent to the
+        server in one round-trip and executed there in order. The yielded
+        list is filled with the individual responses once the block exits.
+        Nested blocks join the outermost batch.
+
+        Example:
+        --------
+        with api.batch() as responses:
+            api.add_dataset('lc', dataset='lc01')
+            api.set_value(twig='pblum_mode@lc01', value='dataset-scaled')
+        """
+        if getattr(self._batch, 'queue', None) is not None:
+            yield []
+            return
+
+        self._batch.queue = []
+        responses = []
+        try:
+            yield responses
+            commands = self._batch.queue
+        finally:
+            self._batch.queue = None
+
+        if commands:
+            response = self.send_command({
+                'cmd': 'batch',
+                'params': {'commands': commands}
+            })
+            if not response.get('success', False):
+                raise RuntimeError(f"Batch request failed: {response.get('error', 'Unknown error')}")
+            responses.extend(response['result'])
+
     def change_morphology(self, morphology):
         command = {
             'cmd': 'b.default_binary',
@@ -142,7 +193,7 @@ class PhoebeAPI:
             'cmd': 'b.run_compute',
             'params': kwargs
         }
-        return self.send_command(command)
+        return decode_arrays(self.send_command(command))
 
     def run_solver(self, **kwargs):
         command = {
@@ -2,7 +2,7 @@ import sys
 import zmq
 import phoebe
 import traceback
-from common.serialization import make_json_serializable
+from common.serialization import make_json_serializable, encode_array
 
 
 class PhoebeServer:
@@ -30,7 +30,8 @@ class PhoebeServer:
             'b.remove_dataset': self.remove_dataset,
             'b.run_compute': self.run_compute,
             'b.run_solver': self.run_solver,
-            'status': self.status
+            'status': self.status,
+            'batch': self.batch
         }
 
         print(f"[phoebe_server] Running on port {port}")
@@ -94,6 +95,12 @@ class PhoebeServer:
                 "available_commands": list(self.commands.keys())
             }
 
+    def batch(self, **kwargs):
+        """Run a list of commands in order and return their responses."""
+        commands = kwargs.pop('commands', [])
+
+        return [self.run_command(command) for command in commands]
+
     def version(self):
         """Get Phoebe version."""
         return phoebe.__version__
@@ -209,15 +216,16 @@ class PhoebeServer:
         for dataset in self.bundle.datasets:
             kind = self.bundle[f'{dataset}@dataset'].kind  # 'lc' or 'rv'
 
+            # model arrays are sent as encoded buffers, see encode_array():
             result[dataset] = {}
-            result[dataset]['times'] = self.bundle.get_value('compute_times', dataset=dataset, context='dataset')
-            result[dataset]['phases'] = self.bundle.get_value('compute_phases', dataset=dataset, context='dataset')
+            result[dataset]['times'] = encode_array(self.bundle.get_value('compute_times', dataset=dataset, context='dataset'))
+            result[dataset]['phases'] = encode_array(self.bundle.get_value('compute_phases', dataset=dataset, context='dataset'))
 
             if kind == 'lc':
-                result[dataset]['fluxes'] = self.bundle.get_value('fluxes', dataset=dataset, context='model')
+                result[dataset]['fluxes'] = encode_array(self.bundle.get_value('fluxes', dataset=dataset, context='model'))
             if kind == 'rv':
-                result[dataset]['rv1s'] = self.bundle.get_value('rvs', dataset=dataset, component='primary', context='model')
-                result[dataset]['rv2s'] = self.bundle.get_value('rvs', dataset=dataset, component='secondary', context='model')
+                result[dataset]['rv1s'] = encode_array(self.bundle.get_value('rvs', dataset=dataset, component='primary', context='model'))
+                result[dataset]['rv2s'] = encode_array(self.bundle.get_value('rvs', dataset=dataset, component='secondary', context='model'))
 
         return {"success": True, "message": "Compute completed successfully", "model": result}
 
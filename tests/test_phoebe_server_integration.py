@@ -49,6 +49,38 @@ def test_phoebe_server_integration():
         pytest.fail(f"Failed to launch Phoebe server or test communication: {e}")
 
 
+def test_batch_command():
+    """Test that batch runs commands in order and reports each response."""
+    session = session_manager.launch_phoebe_server()
+    client_id = session['client_id']
+    port = session['port']
+
+    try:
+        batch_command = {
+            'cmd': 'batch',
+            'params': {
+                'commands': [
+                    {'cmd': 'status'},
+                    {'cmd': 'phoebe.version'},
+                    {'cmd': 'no.such.command'},
+                    {'cmd': 'b.set_value', 'params': {'twig': 'period@binary@orbit@component', 'value': 1.5}},
+                    {'cmd': 'b.get_value', 'params': {'twig': 'period@binary@orbit@component'}}
+                ]
+            }
+        }
+        response = send_command(port=port, command=batch_command)
+
+        assert response.get('success') is True
+        responses = response['result']
+        assert [r['success'] for r in responses] == [True, True, False, True, True]
+        assert 'Unknown command' in responses[2]['error']
+        # a failing command does not stop the batch, and later commands see earlier ones:
+        assert responses[4]['result'] == pytest.approx(1.5)
+
+    finally:
+        session_manager.shutdown_server(client_id)
+
+
 # def test_phoebe_phase_calculation():
 #     """Test phase calculation through server."""
 #     try:
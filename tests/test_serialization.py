@@ -0,0 +1,77 @@
+"""Unit tests for the JSON wire format helpers in common.serialization."""
+
+import sys
+import os
+import json
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from common.serialization import make_json_serializable, encode_array, decode_arrays
+
+
+def roundtrip(obj):
+    """Encode, send through JSON text and decode, like a server response."""
+    return decode_arrays(json.loads(json.dumps(obj)))
+
+
+def test_encode_array_roundtrip_dtypes():
+    """Values and dtypes survive the round-trip; byte order is normalized."""
+    for array in (
+        np.linspace(0.0, 1.0, 11),
+        np.linspace(0.0, 1.0, 11, dtype=np.float32),
+        np.arange(-5, 5, dtype=np.int32),
+        np.arange(5, dtype=np.int64),
+        np.array([True, False, True]),
+        np.arange(4.0).astype('>f8'),
+    ):
+        decoded = roundtrip(encode_array(array))
+        assert np.array_equal(decoded, array)
+        assert decoded.dtype == array.dtype.newbyteorder('<')
+
+
+def test_encode_array_roundtrip_shapes():
+    """Shapes, including empty and 0-d arrays, survive the round-trip."""
+    for array in (
+        np.arange(12.0).reshape(3, 4),
+        np.arange(12.0).reshape(3, 4).T,  # not contiguous
+        np.empty(0),
+        np.empty((0, 3)),
+        np.array(2.5),
+    ):
+        decoded = roundtrip(encode_array(array))
+        assert decoded.shape == array.shape
+        assert np.array_equal(decoded, array)
+
+
+def test_encode_array_accepts_lists():
+    decoded = roundtrip(encode_array([0.5, 1.5]))
+    assert decoded.dtype == np.float64
+    assert np.array_equal(decoded, [0.5, 1.5])
+
+
+def test_decode_arrays_nested():
+    """Encoded arrays are decoded anywhere in a response; other values pass through."""
+    response = {
+        'success': True,
+        'result': {
+            'model': {'lc01': {'fluxes': encode_array(np.ones(3)), 'label': 'lc01'}},
+            'batch': [encode_array(np.zeros(2)), {'success': False, 'error': 'x'}, None, 1.5],
+        }
+    }
+    decoded = roundtrip(response)
+
+    assert np.array_equal(decoded['result']['model']['lc01']['fluxes'], np.ones(3))
+    assert decoded['result']['model']['lc01']['label'] == 'lc01'
+    assert np.array_equal(decoded['result']['batch'][0], np.zeros(2))
+    assert decoded['result']['batch'][1:] == [{'success': False, 'error': 'x'}, None, 1.5]
+    assert decoded['success'] is True
+
+
+def test_encoded_array_is_json_serializable():
+    """Encoded arrays pass unchanged through make_json_serializable."""
+    encoded = {'phases': encode_array(np.linspace(-0.5, 0.5, 5))}
+    assert make_json_serializable(encoded) == encoded
+    assert np.array_equal(roundtrip(make_json_serializable(encoded))['phases'], np.linspace(-0.5, 0.5, 5))
@@ -0,0 +1,136 @@
+"""Unit tests for the numeric transforms in ui.utils."""
+
+import sys
+import os
+import base64
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ui import utils
+
+
+def test_flux_to_magnitude_with_error_matches_ufuncs():
+    """The fused conversion agrees with the separate conversions."""
+    rng = np.random.default_rng(1)
+    flux = rng.uniform(0.5, 2.0, 100)
+    flux_error = rng.uniform(0.0, 0.1, 100)
+
+    for dtype in (np.float32, np.float64):
+        magnitude, magnitude_error = utils.flux_to_magnitude_with_error(flux.astype(dtype), flux_error.astype(dtype), 1.0)
+        assert np.allclose(magnitude, utils.flux_to_magnitude(flux, 1.0), rtol=1e-5)
+        assert np.allclose(magnitude_error, utils.flux_error_to_magnitude_error(flux, flux_error), rtol=1e-5)
+
+
+def test_flux_to_magnitude_with_error_zero_and_nan_flux():
+    """Zero and NaN fluxes give inf/NaN magnitudes instead of raising."""
+    flux = np.array([0.0, np.nan, 1.0])
+    flux_error = np.array([0.1, 0.1, 0.1])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitude, magnitude_error = utils.flux_to_magnitude_with_error(flux, flux_error)
+
+    assert np.isposinf(magnitude[0]) and np.isposinf(magnitude_error[0])
+    assert np.isnan(magnitude[1]) and np.isnan(magnitude_error[1])
+    assert magnitude[2] == 0.0
+
+
+def test_to_typed_array():
+    """Float arrays are encoded as decodable bdata, anything else is unchanged."""
+    for values in (np.linspace(0.0, 1.0, 7), np.linspace(0.0, 1.0, 7, dtype=np.float32), np.arange(3.0).astype('>f8')):
+        typed = utils.to_typed_array(values)
+        decoded = np.frombuffer(base64.b64decode(typed['bdata']), dtype='<' + typed['dtype'])
+        assert np.array_equal(decoded, values)
+
+    assert utils.to_typed_array([0.5, 1.5])['dtype'] == 'f8'
+    assert isinstance(utils.to_typed_array(np.arange(3)), np.ndarray)
+    assert utils.to_typed_array(None) is None
+    assert utils.to_typed_array(np.zeros((2, 2))).shape == (2, 2)
+
+
+def test_downsample_indices():
+    """Decimation keeps at most max_points indices, including the extremes."""
+    assert np.array_equal(utils.downsample_indices(np.arange(10.0), 20), np.arange(10))
+
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=100_003)
+    values[12345] = -50.0  # a narrow eclipse
+    indices = utils.downsample_indices(values, 1000)
+
+    assert len(indices) <= 1000
+    assert np.all(np.diff(indices) > 0)
+    assert values.argmin() in indices and values.argmax() in indices
+    assert indices.max() < len(values)
+
+
+def reference_alias_data(data, extend_range):
+    phase = data[:, 0]
+    right = data[(phase > 0.5 - extend_range) & (phase <= 0.5)].copy()
+    right[:, 0] -= 1.0
+    left = data[(phase >= -0.5) & (phase < -0.5 + extend_range)].copy()
+    left[:, 0] += 1.0
+    aliased = np.concatenate((right, data, left))
+    return aliased[np.argsort(aliased[:, 0], kind='stable')]
+
+
+def test_alias_data_matches_reference():
+    """Aliasing agrees with the boolean-mask reference, sorted or not."""
+    rng = np.random.default_rng(4)
+    data = np.column_stack((rng.uniform(-0.5, 0.5, 500), rng.uniform(size=500), rng.uniform(size=500)))
+
+    for rows in (data, data[np.argsort(data[:, 0])]):
+        aliased = utils.alias_data(rows, 0.1)
+        expected = reference_alias_data(rows, 0.1)
+        assert aliased.shape == expected.shape
+        assert np.all(np.diff(aliased[:, 0]) >= 0)
+        # ties may be ordered differently, compare as sorted rows:
+        assert np.allclose(aliased[np.lexsort(aliased.T[::-1])], expected[np.lexsort(expected.T[::-1])])
+
+
+def test_alias_data_edge_cases():
+    """Empty input, exact edges and phases beyond [-0.5, 0.5]."""
+    assert utils.alias_data(np.empty((0, 2)), 0.1).shape == (0, 2)
+
+    edges = np.array([[-0.5, 1.0], [0.0, 2.0], [0.5, 3.0]])
+    assert np.allclose(utils.alias_data(edges, 0.1), reference_alias_data(edges, 0.1))
+
+    beyond = np.array([[-0.7, 1.0], [0.0, 2.0], [0.45, 3.0], [0.8, 4.0]])
+    aliased = utils.alias_data(beyond, 0.1)
+    assert np.all(np.diff(aliased[:, 0]) >= 0)
+    assert np.allclose(aliased, reference_alias_data(beyond, 0.1))
+
+
+def reference_time_to_phase(time, period, t0):
+    phase = ((time - t0) % period) / period
+    return np.where(phase > 0.5, phase - 1.0, phase)
+
+
+def test_shift_phase_matches_refold():
+    """Shifting folded phases by dt0 matches folding with t0 + dt0."""
+    rng = np.random.default_rng(3)
+    time = rng.uniform(2460000.0, 2460100.0, 1000)
+    phase = utils.time_to_phase(time, 2.5, 2460000.3)
+
+    for dt0 in (0.3, -1.7, 12.25, 1e-9):
+        shifted = utils.shift_phase(phase, 2.5, dt0)
+        refolded = reference_time_to_phase(time, 2.5, 2460000.3 + dt0)
+        # phases of -0.5 and 0.5 are the same point:
+        difference = np.abs(shifted - refolded)
+        assert np.all(np.minimum(difference, 1.0 - difference) < 1e-9)
+        assert shifted.min() >= -0.5 and shifted.max() <= 0.5
+
+
+def test_time_to_phase_matches_reference():
+    """Folding agrees with the numpy reference, also on the parallel path."""
+    rng = np.random.default_rng(2)
+    for n in (1000, 200_000):
+        time = rng.uniform(2460000.0, 2460100.0, n)
+        phase = utils.time_to_phase(time, 2.5, 2460000.3)
+        assert np.allclose(phase, reference_time_to_phase(time, 2.5, 2460000.3))
+        assert phase.min() >= -0.5 and phase.max() <= 0.5
+
+        out = np.empty_like(time)
+        assert utils.time_to_phase(time, 2.5, 2460000.3, out=out) is out
+        assert np.array_equal(out, phase)
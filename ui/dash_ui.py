@@ -1,5 +1,6 @@
 from nicegui import ui
 from client.session_api import SessionAPI
+from asyncio import gather, get_event_loop
 
 
 class SessionManagerUI:
@@ -56,10 +57,12 @@ class SessionManagerUI:
             ui.notify(f"Error fetching sessions: {e}", type='negative')
             return {}
 
-    def refresh_sessions(self):
+    async def refresh_sessions(self):
         """Refresh the session table by fetching current sessions from the server."""
         try:
-            sessions = self.get_sessions()
+            # The session manager requests run in the executor, so they do
+            # not block the event loop (and with it all connected clients):
+            sessions = await get_event_loop().run_in_executor(None, self.api.get_sessions)
             # Clear current rows and add fresh data
             self.table.rows.clear()
             for client_id, meta in sessions.items():
@@ -76,14 +79,17 @@ class SessionManagerUI:
         except Exception as e:
             ui.notify(f"Error refreshing sessions: {e}", type='negative')
 
-    def update_data(self):
+    async def update_data(self):
         """Update memory usage and port status for all sessions."""
         try:
-            # Update memory usage
-            memory_data = self.api.get_memory_usage()
-
-            # Get fresh session data to update user info
-            sessions_data = self.api.get_sessions()
+            # Fetch memory usage, fresh session data (for user info) and port
+            # status concurrently:
+            loop = get_event_loop()
+            memory_data, sessions_data, port_status = await gather(
+                loop.run_in_executor(None, self.api.get_memory_usage),
+                loop.run_in_executor(None, self.api.get_sessions),
+                loop.run_in_executor(None, self.api.get_port_status),
+            )
 
             # Update memory usage and user info for each row
             for row in self.table.rows:
@@ -94,7 +100,6 @@ class SessionManagerUI:
                     row['user_display_name'] = sessions_data[client_id].get('user_display_name', 'Not logged in')
 
             # Update port status
-            port_status = self.api.get_port_status()
             self.port_status_label.text = f"Ports: {port_status['available_ports']}/{port_status['total_ports']} available"
 
             # Update the table with new values
@@ -103,28 +108,36 @@ class SessionManagerUI:
             # Silently skip errors to avoid spamming notifications
             pass
 
-    def start_session(self):
+    async def start_session(self):
         try:
-            new_session = self.api.start_session()
+            new_session = await get_event_loop().run_in_executor(None, self.api.start_session)
             self.table.add_row(new_session)
         except Exception as e:
             ui.notify(f"Error: {e}", type='negative')
 
-    def close_session(self):
-        selected_rows = self.table.selected
+    async def close_session(self):
+        selected_rows = list(self.table.selected)
         if not selected_rows:
             ui.notify("No session selected", type='warning')
             return
 
-        try:
-            for row in selected_rows:
-                self.api.end_session(row['client_id'])
+        # End all selected sessions concurrently:
+        loop = get_event_loop()
+        results = await gather(
+            *(loop.run_in_executor(None, self.api.end_session, row['client_id']) for row in selected_rows),
+            return_exceptions=True
+        )
+
+        closed_rows = []
+        for row, result in zip(selected_rows, results):
+            if isinstance(result, Exception):
+                ui.notify(f"Error closing session {row['client_id']}: {result}", type='negative')
+            else:
                 ui.notify(f"Closed session {row['client_id']}")
+                closed_rows.append(row)
 
-            self.table.remove_rows(selected_rows)
-
-        except Exception as e:
-            ui.notify(f"Error closing session: {e}", type='negative')
+        if closed_rows:
+            self.table.remove_rows(closed_rows)
 
 
 if __name__ in {"__main__", "__mp_main__"}:
@@ -1,11 +1,85 @@
 from nicegui import ui
 import numpy as np
 import plotly.graph_objects as go
+import io
+import os
+from collections import OrderedDict
 from pathlib import Path
+from types import MappingProxyType
 from client.session_api import SessionAPI
 from client.phoebe_api import PhoebeAPI
-from ui.utils import time_to_phase, alias_data, flux_to_magnitude
-from asyncio import get_event_loop
+from ui.utils import time_to_phase, shift_phase, alias_data, flux_to_magnitude, flux_to_magnitude_with_error, downsample_indices, to_typed_array, jit_warmup
+from asyncio import CancelledError, get_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import count
+from time import monotonic
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Traces with more points than this are rendered with WebGL (go.Scattergl),
+# SVG rendering stalls the browser for large light curves:
+WEBGL_THRESHOLD = 5000
+
+# Traces with more points than this are decimated before plotting; the
+# screen cannot resolve more, and they would only slow down the browser:
+MAX_PLOT_POINTS = 20000
+
+# Number of parsed example files kept in memory:
+DATA_CACHE_SIZE = 8
+
+# Bundled example data files:
+# TODO: move example file location to a config file
+_EXAMPLES_DIR = Path(__file__).resolve().parent.parent / 'examples'
+_EXAMPLES_EXISTS = _EXAMPLES_DIR.is_dir()
+
+# Descriptions shown on the example file cards, keyed by file name:
+_FILE_DESCRIPTIONS = MappingProxyType({
+    'tic219178975.gochile.R': 'TIC 219178975 light curve, GoChile R band (relative flux)',
+})
+
+# Number of folded (phased) observation arrays kept in memory:
+PHASE_CACHE_SIZE = 16
+
+# Seconds a notification stays on screen (Quasar's default timeout); the
+# same repeated warning is not shown again within this time:
+NOTIFY_TIMEOUT = 5.0
+
+# Seconds a numeric parameter value needs to settle before it is sent to
+# the server, so that typing a value does not send every keystroke:
+DEBOUNCE_DELAY = 0.25
+
+# Long-running compute and solver requests wait on the server in their own
+# threads, so they cannot starve the default executor used for file loading
+# and short API calls. The work itself runs in the server process.
+_COMPUTE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='phoebe-compute')
+
+# Adjustable parameters shown in the parameter panel, as (expansion title,
+# icon, name of the PhoebeUI method notified of value changes, parameters):
+_PARAMETER_GROUPS = (
+    ('Ephemerides', 'schedule', 'on_ephemeris_changed', (
+        {'twig': 't0_supconj@binary', 'label': 'T₀ (BJD)', 'step': 0.01, 'vformat': '%.8f', 'sformat': '%.3f'},
+        {'twig': 'period@binary', 'label': 'Period (d)', 'step': 0.0001, 'vformat': '%.8f', 'sformat': '%.3f'},
+    )),
+    ('Primary Star', 'wb_sunny', None, (
+        {'twig': 'mass@primary@component', 'label': 'Mass (M₀)', 'step': 0.01},
+        {'twig': 'requiv@primary@component', 'label': 'Radius (R₀)', 'step': 0.01},
+        {'twig': 'teff@primary@component', 'label': 'Temperature (K)', 'step': 10.0, 'vformat': '%d'},
+    )),
+    ('Secondary Star', 'wb_sunny', None, (
+        {'twig': 'mass@secondary@component', 'label': 'Mass (M₀)', 'step': 0.01},
+        {'twig': 'requiv@secondary@component', 'label': 'Radius (R₀)', 'step': 0.01},
+        {'twig': 'teff@secondary@component', 'label': 'Temperature (K)', 'step': 10.0, 'vformat': '%d'},
+    )),
+    ('Orbit', 'trip_origin', None, (
+        {'twig': 'incl@binary@component', 'label': 'Inclination (°)', 'step': 0.1},
+        {'twig': 'ecc@binary@component', 'label': 'Eccentricity', 'step': 0.01},
+        {'twig': 'per0@binary@component', 'label': 'Argument of periastron (°)', 'step': 1.0},
+    )),
+)
 
 
 class PhoebeParameterWidget:
@@ -64,7 +138,12 @@ class PhoebeParameterWidget:
         if response['success']:
             self.set_sensitive(not response['result'])
 
-        self.widget.on('update:model-value', self.on_value_changed)
+        # numeric inputs fire on every keystroke, so debounce them:
+        self.debounce_timer = None
+        if par['Class'] in ['FloatParameter', 'IntParameter']:
+            self.widget.on('update:model-value', self.on_value_typed)
+        else:
+            self.widget.on('update:model-value', self.on_value_changed)
 
     def set_sensitive(self, sensitive: bool):
         if sensitive:
@@ -93,6 +172,21 @@ class PhoebeParameterWidget:
         if self.widget:
             self.widget.value = value
 
+    def on_value_typed(self, event):
+        """Restart the debounce timer; the value is sent once typing settles."""
+        if self.debounce_timer is not None:
+            self.debounce_timer.cancel()
+        self.debounce_timer = ui.timer(DEBOUNCE_DELAY, self.flush, once=True)
+
+    def flush(self):
+        """Send a typed value now if it is still waiting for the debounce timer."""
+        if self.debounce_timer is None:
+            return
+
+        self.debounce_timer.cancel()
+        self.debounce_timer = None
+        self.on_value_changed(event=False)
+
     def on_value_changed(self, event):
         if event is None:
             return
@@ -182,19 +276,22 @@ class PhoebeAdjustableParameterWidget:
     def on_value_changed(self, event=None):
         return self.value_input.on_value_changed(event)
 
+    def flush(self):
+        self.value_input.flush()
+
     def on_adjust_toggled(self):
         """Handle adjust checkbox state change."""
         self.adjust = self.adjust_checkbox.value
 
-        if self.adjust:
-            self.step_input.enable()
-            self.step_input.classes(remove='text-gray-400')
-            if self.ui.fully_initialized:
+        # Both changes only mark the step input dirty; NiceGUI sends it to
+        # the client once, at the end of this handler:
+        self.step_input.set_enabled(self.adjust)
+        self.step_input.classes(remove='text-gray-400') if self.adjust else self.step_input.classes(add='text-gray-400')
+
+        if self.ui.fully_initialized:
+            if self.adjust:
                 self.ui.add_parameter_to_solver_table(self)
-        else:
-            self.step_input.disable()
-            self.step_input.classes(add='text-gray-400')
-            if self.ui.fully_initialized:
+            else:
                 self.ui.remove_parameter_from_solver_table(self)
 
 
@@ -203,6 +300,17 @@ class DatasetModel:
         self.api = api
         self.datasets = {}
 
+        # Compute phase grids, keyed by (phase_min, phase_max, n_points):
+        self.phase_cache = {}
+
+        # Source of dataset revisions; a dataset gets a new revision whenever
+        # its observations or model change:
+        self.revisions = count(1)
+
+        # Dataset table rows, keyed by dataset label; kept in sync with the
+        # datasets so that refreshing the table does not rebuild them:
+        self.table_rows = {}
+
         # Define a dataset model:
         self.model = {
             'kind': 'lc',
@@ -222,7 +330,8 @@ class DatasetModel:
             'phase_max': 0.5,
             'data_points': 0,
             'plot_data': False,
-            'plot_model': False
+            'plot_model': False,
+            'revision': 0
         }
 
     def add(self, **kwargs):
@@ -246,13 +355,33 @@ class DatasetModel:
             **kwargs
         })
 
+        # Observations are stored as float64 arrays (views, if they already
+        # are), so downstream consumers never need to convert them:
+        for key in ['times', 'fluxes', 'rv1s', 'rv2s', 'sigmas']:
+            dataset_meta[key] = np.asarray(dataset_meta[key], dtype=np.float64)
+        dataset_meta['data_points'] = dataset_meta['times'].size
+        dataset_meta['revision'] = next(self.revisions)
+
         self.datasets[dataset] = dataset_meta
+        self.table_rows[dataset] = self.make_table_row(dataset_meta)
 
-        compute_phases = np.linspace(
-            dataset_meta['phase_min'],
-            dataset_meta['phase_max'],
-            dataset_meta['n_points']
-        )
+        return dataset_meta
+
+    def push(self, dataset):
+        """
+        Add a dataset registered with add() to the bundle.
+
+        Raises RuntimeError if the server fails to add or configure it; the
+        bundle is then left without the dataset.
+
+        This blocks on the api; the UI runs it in an executor, while add()
+        and discard(), which mutate the datasets the UI iterates over, run
+        on the event loop.
+        """
+        dataset_meta = self.datasets[dataset]
+        kind = dataset_meta['kind']
+
+        compute_phases = self.get_compute_phases(dataset_meta)
 
         # Call API to add the dataset:
         params = {
@@ -268,49 +397,134 @@ class DatasetModel:
             params['rv1s'] = dataset_meta.get('rv1s', [])
             params['rv2s'] = dataset_meta.get('rv2s', [])
 
-        self.api.add_dataset(kind, **params)
+        # Adding the dataset and setting its pblum mode is one round-trip:
+        with self.api.batch() as responses:
+            self.api.add_dataset(kind, **params)
+
+            # set pblum_mode to dataset-scaled if we have actual data:
+            if dataset_meta['fluxes'].size > 0 or dataset_meta['rv1s'].size > 0 or dataset_meta['rv2s'].size > 0:
+                self.api.set_value(twig=f'pblum_mode@{dataset}', value='dataset-scaled')
+
+        failed = [response for response in responses if not response.get('success', False)]
+        if failed:
+            # don't leave a half-configured dataset in the bundle; the caller
+            # discards it locally:
+            if responses[0].get('success', False):
+                self.api.remove_dataset(dataset)
+            raise RuntimeError(f"Failed to add dataset {dataset}: {failed[0].get('error', 'Unknown error')}")
+
+    def get_compute_phases(self, dataset_meta):
+        """
+        Return the compute phases of a dataset.
+
+        Phase grids are cached and shared between datasets with the same
+        phase range and length, so the returned array is read-only.
+        """
+        key = (
+            round(dataset_meta['phase_min'], 6),
+            round(dataset_meta['phase_max'], 6),
+            int(dataset_meta['n_points'])
+        )
+
+        compute_phases = self.phase_cache.get(key)
+        if compute_phases is None:
+            compute_phases = np.linspace(*key)
+            compute_phases.flags.writeable = False
+            self.phase_cache[key] = compute_phases
+
+        return compute_phases
 
-        # set pblum_mode to dataset-scaled if we have actual data:
-        if len(dataset_meta['fluxes']) > 0 or len(dataset_meta['rv1s']) > 0 or len(dataset_meta['rv2s']) > 0:
-            self.api.set_value(twig=f'pblum_mode@{dataset}', value='dataset-scaled')
+    def get_all_datasets(self):
+        """
+        Return a read-only view of all datasets, keyed by dataset label.
+
+        The view is live and is not a copy; dataset dicts inside it are
+        shared with the model, so callers must not modify them.
+        """
+        return MappingProxyType(self.datasets)
 
     def remove(self, dataset):
         if dataset not in self.datasets:
             raise ValueError(f'Dataset {dataset} does not exist.')
 
         self.api.remove_dataset(dataset)
+        self.discard(dataset)
+
+    def discard(self, dataset):
+        """Forget a dataset locally, without touching the bundle."""
         del self.datasets[dataset]
+        del self.table_rows[dataset]
 
-    def readd_all(self):
-        for dataset in self.datasets.values():
-            compute_phases = np.linspace(
-                dataset['phase_min'],
-                dataset['phase_max'],
-                dataset['n_points']
-            )
+    def make_table_row(self, dataset_meta):
+        phases_str = f"({dataset_meta['phase_min']:.2f}, {dataset_meta['phase_max']:.2f}, {dataset_meta['n_points']})"
 
-            params = {
-                'dataset': dataset.get('dataset'),
-                'passband': dataset.get('passband'),
-                'compute_phases': compute_phases,
-                'times': dataset.get('times'),
-                'sigmas': dataset.get('sigmas')
-            }
+        return {
+            'label': dataset_meta['dataset'],
+            'type': dataset_meta['kind'],
+            'passband': dataset_meta['passband'],
+            'filename': dataset_meta['filename'],
+            'phases': phases_str,
+            'data_points': dataset_meta['data_points'],
+            'plot_data': dataset_meta['plot_data'],
+            'plot_model': dataset_meta['plot_model']
+        }
+
+    def get_table_rows(self):
+        return list(self.table_rows.values())
+
+    def set_model(self, dataset, fluxes=None, rv1s=None, rv2s=None):
+        dataset_meta = self.datasets[dataset]
+        dataset_meta['model_fluxes'] = fluxes if fluxes is not None else []
+        dataset_meta['model_rv1s'] = rv1s if rv1s is not None else []
+        dataset_meta['model_rv2s'] = rv2s if rv2s is not None else []
+        dataset_meta['revision'] = next(self.revisions)
+
+    def set_plot_flag(self, dataset, field, state):
+        if field not in ['plot_data', 'plot_model']:
+            raise ValueError(f'Unknown plot flag {field}.')
+
+        if field == 'plot_data' and state and self.datasets[dataset]['data_points'] == 0:
+            raise ValueError(f'Dataset {dataset} has no observations to plot.')
 
-            if dataset['kind'] == 'lc':
-                params['fluxes'] = dataset.get('fluxes', [])
-            if dataset['kind'] == 'rv':
-                params['rv1s'] = dataset.get('rv1s', [])
-                params['rv2s'] = dataset.get('rv2s', [])
+        self.datasets[dataset][field] = state
+        self.table_rows[dataset][field] = state
 
-            self.api.add_dataset(**params)
-            if len(dataset['fluxes']) > 0 or len(dataset['rv1s']) > 0 or len(dataset['rv2s']) > 0:
-                self.api.set_value(twig=f'pblum_mode@{dataset["dataset"]}', value='dataset-scaled')
+    def readd_all(self):
+        # All datasets are re-added in a single round-trip:
+        with self.api.batch():
+            # readd_all runs in an executor: iterate over a snapshot
+            for dataset in list(self.datasets.values()):
+                compute_phases = self.get_compute_phases(dataset)
+
+                params = {
+                    'kind': dataset['kind'],
+                    'dataset': dataset.get('dataset'),
+                    'passband': dataset.get('passband'),
+                    'compute_phases': compute_phases,
+                    'times': dataset.get('times'),
+                    'sigmas': dataset.get('sigmas')
+                }
+
+                if dataset['kind'] == 'lc':
+                    params['fluxes'] = dataset.get('fluxes', [])
+                if dataset['kind'] == 'rv':
+                    params['rv1s'] = dataset.get('rv1s', [])
+                    params['rv2s'] = dataset.get('rv2s', [])
+
+                self.api.add_dataset(**params)
+                if dataset['fluxes'].size > 0 or dataset['rv1s'].size > 0 or dataset['rv2s'].size > 0:
+                    self.api.set_value(twig=f'pblum_mode@{dataset["dataset"]}', value='dataset-scaled')
 
 
 class PhoebeUI:
     """Main Phoebe UI."""
 
+    # Example data files, listed once per process (see get_example_files):
+    _example_files = None
+
+    # Light curve plot layout, built once per process (see create_empty_styled_lc_plot):
+    _lc_layout = None
+
     def __init__(self, session_api: SessionAPI = None, phoebe_api: PhoebeAPI = None):
         # there are many callbacks that depend on the UI being fully
         # initialized, so we keep the UI state explicitly:
@@ -328,6 +542,22 @@ class PhoebeUI:
         # Reference to widgets:
         self.widgets = {}
 
+        # Set while a dataset panel refresh is pending:
+        self.dataset_panel_refresh_scheduled = False
+
+        # Parsed example files, keyed by (path, mtime):
+        self.data_cache = OrderedDict()
+
+        # Folded observation times, keyed by (dataset, period, t0):
+        self.phase_cache = OrderedDict()
+
+        # Pending run_compute request while a model is being computed:
+        self.compute_future = None
+
+        # Times at which repeatable notifications were last shown, keyed by
+        # (message, type):
+        self.notified = {}
+
         # Initialize dialogs:
         self.dataset = DatasetModel(api=self.phoebe_api)
         self.dataset_dialog = self.create_dataset_dialog()
@@ -335,8 +565,9 @@ class PhoebeUI:
         # Show startup dialog first
         self.show_startup_dialog()
 
-        # Create main UI (will be shown after dialog)
-        with ui.splitter(value=30).classes('w-full h-screen') as self.main_splitter:
+        # Create main UI (will be shown after dialog); it is laid out hidden
+        # behind the dialog, so showing it does not need a relayout:
+        with ui.splitter(value=30).classes('w-full h-screen').style('visibility: hidden') as self.main_splitter:
             # Left panel - Parameters, data, and controls
             with self.main_splitter.before:
                 with ui.scroll_area().classes('w-full h-full p-4'):
@@ -347,9 +578,15 @@ class PhoebeUI:
                 self.create_analysis_panel()
 
             # Allow plot width change on splitter drag
-            # Handle plot resize on splitter change
+            # Handle plot resize on splitter change; dragging fires many
+            # changes per frame, so the resize is deferred to the next
+            # animation frame and earlier pending ones are dropped
             plot_id = self.lc_canvas.id
-            plot_resize_js = f'Plotly.Plots.resize(getHtmlElement({plot_id}))'
+            plot_resize_js = (
+                f'cancelAnimationFrame(window.plotResizeFrame{plot_id}); '
+                f'window.plotResizeFrame{plot_id} = requestAnimationFrame('
+                f'() => Plotly.Plots.resize(getHtmlElement({plot_id})))'
+            )
             self.main_splitter.on_value_change(lambda: ui.run_javascript(plot_resize_js))
 
         self.fully_initialized = True
@@ -391,100 +628,17 @@ class PhoebeUI:
         ).classes('w-full mb-4')
         self.morphology_select.on('update:model-value', self._on_morphology_change)
         self._current_morphology = 'detached'  # Track current morphology
-
-        # Ephemerides parameters
-        with ui.expansion('Ephemerides', icon='schedule', value=False).classes('w-full mb-4'):
-            # Create parameter widgets for t0 and period
-            self.add_parameter(
-                twig='t0_supconj@binary',
-                label='T₀ (BJD)',
-                step=0.01,
-                adjust=False,
-                vformat='%.8f',
-                sformat='%.3f',
-                on_value_changed=self.on_ephemeris_changed
-            )
-
-            self.add_parameter(
-                twig='period@binary',
-                label='Period (d)',
-                step=0.0001,
-                adjust=False,
-                vformat='%.8f',
-                sformat='%.3f',
-                on_value_changed=self.on_ephemeris_changed
-            )
-
-        # Primary star parameters
-        with ui.expansion('Primary Star', icon='wb_sunny', value=False).classes('w-full mb-4'):
-            self.add_parameter(
-                twig='mass@primary@component',
-                label='Mass (M₀)',
-                step=0.01,
-                adjust=False,
-            )
-
-            self.add_parameter(
-                twig='requiv@primary@component',
-                label='Radius (R₀)',
-                step=0.01,
-                adjust=False,
-            )
-
-            self.add_parameter(
-                twig='teff@primary@component',
-                label='Temperature (K)',
-                vformat='%d',
-                step=10.0,
-                adjust=False,
-            )
-
-        # Secondary star parameters
-        with ui.expansion('Secondary Star', icon='wb_sunny', value=False).classes('w-full mb-4'):
-            self.add_parameter(
-                twig='mass@secondary@component',
-                label='Mass (M₀)',
-                step=0.01,
-                adjust=False,
-            )
-
-            self.add_parameter(
-                twig='requiv@secondary@component',
-                label='Radius (R₀)',
-                step=0.01,
-                adjust=False,
-            )
-
-            self.add_parameter(
-                twig='teff@secondary@component',
-                label='Temperature (K)',
-                vformat='%d',
-                step=10.0,
-                adjust=False,
-            )
-
-        # Orbit parameters
-        with ui.expansion('Orbit', icon='trip_origin', value=False).classes('w-full mb-4'):
-            self.add_parameter(
-                twig='incl@binary@component',
-                label='Inclination (°)',
-                step=0.1,
-                adjust=False,
-            )
-
-            self.add_parameter(
-                twig='ecc@binary@component',
-                label='Eccentricity',
-                step=0.01,
-                adjust=False,
-            )
-
-            self.add_parameter(
-                twig='per0@binary@component',
-                label='Argument of periastron (°)',
-                step=1.0,
-                adjust=False,
-            )
+        self.morphology_dialog = self.create_morphology_dialog()
+
+        # Adjustable parameters, one expansion per group:
+        for title, icon, hook, parameters in _PARAMETER_GROUPS:
+            with ui.expansion(title, icon=icon, value=False).classes('w-full mb-4'):
+                for parameter in parameters:
+                    self.add_parameter(
+                        adjust=False,
+                        on_value_changed=getattr(self, hook) if hook else None,
+                        **parameter
+                    )
 
     def create_dataset_panel(self):
         with ui.expansion('Dataset Management', icon='table_chart', value=True).classes('w-full mb-2').style('padding: 2px;'):
@@ -513,6 +667,7 @@ class PhoebeUI:
                     }
                 ],
                 'rowData': [],  # start with an empty table
+                ':getRowId': 'params => params.data.label',  # rows are matched by label in transactions
                 'domLayout': 'autoHeight',
                 'suppressHorizontalScroll': False,
                 'enableCellChangeFlash': True,
@@ -521,6 +676,10 @@ class PhoebeUI:
                 # 'theme': 'ag-theme-alpine'
             }).classes('w-full').style('height: auto; min-height: 80px; max-height: 300px;')
 
+            # Rows last sent to the table, keyed by label (None until the
+            # first refresh):
+            self.dataset_table_rows = None
+
             # Store selected row for edit/remove operations
             self.selected_dataset_row = None
 
@@ -664,8 +823,12 @@ class PhoebeUI:
                     # Plot button, styled for alignment
                     ui.button('Plot', on_click=self.on_lc_plot_button_clicked).classes('bg-blue-500 h-10 translate-y-4')
 
-                # Plot container
-                self.lc_canvas = ui.plotly(self.create_empty_styled_lc_plot()).classes('w-full  min-w-0')
+                # Plot container; the figure is created once and its traces
+                # are updated in place on every replot
+                self.lc_figure = self.create_empty_styled_lc_plot()
+                self.lc_fingerprint = None
+                self.ephemeris_timer = None
+                self.lc_canvas = ui.plotly(self.lc_figure).classes('w-full  min-w-0')
 
                 # Add resize observer to handle container size changes
                 self.lc_canvas._props['config'] = {
@@ -730,148 +893,386 @@ class PhoebeUI:
                     self.adopt_solution_button.props('disabled')
 
     def create_empty_styled_lc_plot(self):
-        fig = go.Figure()
-
-        x_title = 'Time (BJD)'
-        y_title = 'Flux'
-
-        fig.update_layout(
-            xaxis_title=x_title,
-            yaxis_title=y_title,
-            hovermode='closest',
-            template='plotly_white',
-            autosize=True,
-            height=400,
-            margin=dict(l=50, r=50, t=50, b=50),
-            xaxis=dict(
-                mirror='allticks',
-                ticks='outside',
-                showline=True,
-                linecolor='black',
-                linewidth=2,
-                zeroline=False,
-                showgrid=True,
-                gridcolor='lightgray',
-                gridwidth=1,
-                griddash='dot'
-            ),
-            yaxis=dict(
-                mirror='allticks',
-                ticks='outside',
-                showline=True,
-                linecolor='black',
-                linewidth=2,
-                # autorange='reversed' if y_reversed else True,
-                zeroline=False,
-                showgrid=True,
-                gridcolor='lightgray',
-                gridwidth=1,
-                griddash='dot'
-            ),
-            plot_bgcolor='white',
-            showlegend=False,
-            uirevision=True
-        )
+        # The layout is the same for all sessions, so it is built and
+        # validated once and copied into each new figure:
+        if PhoebeUI._lc_layout is None:
+            PhoebeUI._lc_layout = go.Layout(
+                xaxis_title='Time (BJD)',
+                yaxis_title='Flux',
+                hovermode='closest',
+                template='plotly_white',
+                autosize=True,
+                height=400,
+                margin=dict(l=50, r=50, t=50, b=50),
+                xaxis=dict(
+                    mirror='allticks',
+                    ticks='outside',
+                    showline=True,
+                    linecolor='black',
+                    linewidth=2,
+                    zeroline=False,
+                    showgrid=True,
+                    gridcolor='lightgray',
+                    gridwidth=1,
+                    griddash='dot'
+                ),
+                yaxis=dict(
+                    mirror='allticks',
+                    ticks='outside',
+                    showline=True,
+                    linecolor='black',
+                    linewidth=2,
+                    autorange=True,
+                    zeroline=False,
+                    showgrid=True,
+                    gridcolor='lightgray',
+                    gridwidth=1,
+                    griddash='dot'
+                ),
+                plot_bgcolor='white',
+                showlegend=False,
+                uirevision=True
+            )
 
-        return fig
+        return go.Figure(layout=PhoebeUI._lc_layout)
 
     def on_lc_plot_update(self):
         # Handle updates to the light curve plot
         return
 
-    def on_lc_plot_button_clicked(self):
-        # We'll redraw the figure from scratch each time.
-        fig = self.create_empty_styled_lc_plot()
+    def get_folded_times(self, dataset, period, t0):
+        # Redraws that do not change the ephemeris (e.g. flux/magnitude
+        # toggles) reuse the last folds. Entries remember the times array
+        # they were folded from, so a re-added dataset is never served stale
+        # phases.
+        times = self.dataset.get_all_datasets()[dataset]['times']
+
+        key = (dataset, period, t0)
+        if key in self.phase_cache and self.phase_cache[key][0] is times:
+            self.phase_cache.move_to_end(key)
+            return self.phase_cache[key][1]
+
+        # Dragging t0 only shifts the phases of an existing fold, which is
+        # cheaper than re-folding the times:
+        phases = None
+        for (cached_dataset, cached_period, cached_t0), (cached_times, cached_phases) in reversed(self.phase_cache.items()):
+            if cached_dataset == dataset and cached_period == period and cached_times is times:
+                phases = shift_phase(cached_phases, period, t0 - cached_t0)
+                break
+
+        if phases is None:
+            phases = time_to_phase(times, period, t0)
+        phases.flags.writeable = False
+
+        self.phase_cache[key] = (times, phases)
+        if len(self.phase_cache) > PHASE_CACHE_SIZE:
+            self.phase_cache.popitem(last=False)
+
+        return phases
+
+    def notify_once(self, message, type='info'):
+        """
+        Show a notification unless the same one is still on screen.
+
+        Used for warnings raised on every replot, which would otherwise
+        stack up while the user drags a value.
+        """
+        now = monotonic()
+        if now - self.notified.get((message, type), -NOTIFY_TIMEOUT) < NOTIFY_TIMEOUT:
+            return
+
+        self.notified[(message, type)] = now
+        ui.notify(message, type=type)
+
+    def get_lc_trace(self, uid):
+        """Return the light curve trace `uid`, or None if it was never plotted."""
+        return next((trace for trace in self.lc_figure.data if trace.uid == uid), None)
+
+    def set_lc_trace(self, uid, x, y, **kwargs):
+        """
+        Update the light curve trace `uid` in place, adding it if needed.
+
+        Returns True if an existing trace was patched, and False if the
+        figure's list of traces changed (so the whole figure must be resent).
+        """
+        trace_type = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+
+        trace = self.get_lc_trace(uid)
+        if trace is not None and not isinstance(trace, trace_type):
+            # the trace crossed the WebGL threshold, so it needs to be replaced:
+            self.lc_figure.data = [trace for trace in self.lc_figure.data if trace.uid != uid]
+            trace = None
+
+        if trace is None:
+            self.lc_figure.add_trace(trace_type(uid=uid, x=x, y=y, **kwargs))
+            return False
+
+        trace.update(x=x, y=y, visible=True, **kwargs)
+        return True
+
+    def get_lc_figure_json(self):
+        """
+        Serialize the light curve figure for the browser, with the trace
+        arrays sent as base64-encoded typed arrays rather than JSON lists.
+        """
+        figure_json = self.lc_figure.to_plotly_json()
+
+        for trace in figure_json['data']:
+            for key in ['x', 'y']:
+                if key in trace:
+                    trace[key] = to_typed_array(trace[key])
+            if 'array' in trace.get('error_y', {}):
+                trace['error_y']['array'] = to_typed_array(trace['error_y']['array'])
+
+        return figure_json
+
+    def patch_lc_canvas(self, uids):
+        """
+        Send the data of traces `uids`, the visibility of all traces and the
+        axis settings to the browser with Plotly.restyle/Plotly.update,
+        instead of resending the whole figure.
+
+        The python figure stays the source of truth: it is stored as the
+        element's options (without sending them), so that a reconnecting
+        client renders the current state.
+        """
+        fig = self.lc_figure
+        indices = [i for i, trace in enumerate(fig.data) if trace.uid in uids]
+
+        def patched(get):
+            return [to_typed_array(get(fig.data[i])) for i in indices]
+
+        layout_update = {
+            'xaxis.title.text': fig.layout.xaxis.title.text,
+            'yaxis.title.text': fig.layout.yaxis.title.text,
+            'yaxis.autorange': fig.layout.yaxis.autorange
+        }
+
+        figure_json = self.get_lc_figure_json()
+        with self.lc_canvas._props.suspend_updates():
+            self.lc_canvas.figure = figure_json
+            self.lc_canvas._props['options'] = figure_json
+
+        self.lc_canvas.run_plot_method('restyle', {'visible': [trace.visible is not False for trace in fig.data]})
+        if indices:
+            data_update = {
+                'x': patched(lambda trace: trace.x),
+                'y': patched(lambda trace: trace.y),
+                'error_y.array': patched(lambda trace: trace.error_y.array)
+            }
+            self.lc_canvas.run_plot_method('update', data_update, layout_update, indices)
+        else:
+            self.lc_canvas.run_plot_method('relayout', layout_update)
+
+    def on_lc_plot_button_clicked(self, ephemeris_changed=False):
+        # The figure persists across redraws: traces are patched in place and
+        # hidden (not dropped) when their dataset is not plotted. When only
+        # the ephemeris changed, observations plotted against time on unchanged
+        # axes are left as they are.
+        fig = self.lc_figure
 
         period = self.parameters['period@binary@orbit@component'].get_value()
         t0 = self.parameters['t0_supconj@binary@orbit@component'].get_value()
 
+        x_axis = self.widgets['lc_plot_x_axis'].value
+        y_axis = self.widgets['lc_plot_y_axis'].value
+
+        # Nothing to do if neither the axes, the ephemeris nor any plotted
+        # dataset changed since the last redraw:
+        fingerprint = (x_axis, y_axis, period, t0, tuple(
+            (ds_label, ds_meta['revision'], ds_meta['plot_data'], ds_meta['plot_model'])
+            for ds_label, ds_meta in self.dataset.get_all_datasets().items()
+        ))
+        if fingerprint == self.lc_fingerprint:
+            return
+
+        # Only the axis-dependent parts of the layout change between redraws;
+        # magnitudes grow fainter downwards:
+        fig.update_layout(
+            xaxis_title='Time (BJD)' if x_axis == 'time' else 'Phase',
+            yaxis_title='Flux' if y_axis == 'flux' else 'Magnitude',
+            yaxis_autorange=True if y_axis == 'flux' else 'reversed'
+        )
+
+        # Observations plotted against time can only be kept if the last
+        # redraw used the same axes:
+        keep_time_data = (
+            ephemeris_changed and x_axis == 'time'
+            and self.lc_fingerprint is not None and self.lc_fingerprint[:2] == (x_axis, y_axis)
+        )
+
+        plotted = set()
+        patched = set()
+        restructured = False
+
         # See what needs to be plotted:
-        for ds_label, ds_meta in self.dataset.datasets.items():
+        for ds_label, ds_meta in self.dataset.get_all_datasets().items():
             if ds_meta['kind'] == 'lc':
-                x_axis = self.widgets['lc_plot_x_axis'].value
-                y_axis = self.widgets['lc_plot_y_axis'].value
+                data_uid, model_uid = f'{ds_label}@data', f'{ds_label}@model'
 
-                if ds_meta['plot_data']:
+                if ds_meta['plot_data'] and keep_time_data:
+                    trace = self.get_lc_trace(data_uid)
+                    if trace is not None and trace.visible is not False:
+                        plotted.add(data_uid)
+
+                if ds_meta['plot_data'] and data_uid not in plotted:
                     if x_axis == 'time':
                         xs = ds_meta['times']
                     else:
-                        xs = time_to_phase(ds_meta['times'], period, t0)
+                        xs = self.get_folded_times(ds_label, period, t0)
 
                     if y_axis == 'flux':
                         ys = ds_meta['fluxes']
+                        es = ds_meta['sigmas']
                     else:
-                        ys = flux_to_magnitude(ds_meta['fluxes'])
+                        ys, es = flux_to_magnitude_with_error(ds_meta['fluxes'], ds_meta['sigmas'])
 
-                    data = np.column_stack((xs, ys))  # we could also add sigmas here
+                    data = np.column_stack((xs, ys, es))
 
                     # Alias phases:
                     if x_axis == 'phase':
                         data = alias_data(data, extend_range=0.1)
 
-                    fig.add_trace(go.Scatter(
-                        x=data[:, 0],
-                        y=data[:, 1],
+                    if len(data) > MAX_PLOT_POINTS:
+                        data = data[downsample_indices(data[:, 1], MAX_PLOT_POINTS)]
+
+                    # computed in float64, plot in display precision (phases
+                    # only; BJDs need float64):
+                    in_place = self.set_lc_trace(
+                        data_uid,
+                        x=data[:, 0] if x_axis == 'time' else data[:, 0].astype(np.float32),
+                        y=data[:, 1].astype(np.float32),
+                        error_y={'type': 'data', 'array': data[:, 2].astype(np.float32), 'visible': True},
                         mode='markers',
                         name=ds_label
-                    ))
+                    )
+                    plotted.add(data_uid)
+                    patched.add(data_uid)
+                    restructured |= not in_place
 
                 if ds_meta['plot_model']:
-                    if not ds_meta['model_fluxes']:
-                        ui.notify(f'No model fluxes available for dataset {ds_label}. Please compute the model first.', type='warning')
-                    compute_phases = np.linspace(ds_meta['phase_min'], ds_meta['phase_max'], ds_meta['n_points'])
+                    if len(ds_meta['model_fluxes']) == 0:
+                        self.notify_once(f'No model fluxes available for dataset {ds_label}. Please compute the model first.', type='warning')
+                        continue
+
+                    compute_phases = self.dataset.get_compute_phases(ds_meta)
                     if x_axis == 'time':
                         xs = t0 + period * compute_phases
                     else:
                         xs = compute_phases
 
+                    # Fill the columns in place, magnitudes are converted
+                    # straight into the stacked array:
+                    model = np.empty((len(compute_phases), 2))
+                    model[:, 0] = xs
                     if y_axis == 'flux':
-                        ys = ds_meta['model_fluxes']
+                        model[:, 1] = ds_meta['model_fluxes']
                     else:
-                        ys = flux_to_magnitude(ds_meta['model_fluxes'])
-
-                    model = np.column_stack((xs, ys))
+                        flux_to_magnitude(np.asarray(ds_meta['model_fluxes'], dtype=np.float64), out=model[:, 1])
 
                     if x_axis == 'phase':
                         model = alias_data(model, extend_range=0.1)
 
-                    fig.add_trace(go.Scatter(
-                        x=model[:, 0],
-                        y=model[:, 1],
+                    if len(model) > MAX_PLOT_POINTS:
+                        model = model[downsample_indices(model[:, 1], MAX_PLOT_POINTS)]
+
+                    # the model stays float64 for fitting, plot in display precision:
+                    in_place = self.set_lc_trace(
+                        model_uid,
+                        x=model[:, 0] if x_axis == 'time' else model[:, 0].astype(np.float32),
+                        y=model[:, 1].astype(np.float32),
                         mode='lines',
                         line={'color': 'red'},
                         name=ds_label
-                    ))
+                    )
+                    plotted.add(model_uid)
+                    patched.add(model_uid)
+                    restructured |= not in_place
+
+        for trace in fig.data:
+            if trace.uid not in plotted:
+                trace.visible = False
+
+        # New or replaced traces need the whole figure; otherwise only the
+        # patched arrays are sent:
+        if restructured:
+            self.lc_canvas.update_figure(self.get_lc_figure_json())
+        else:
+            self.patch_lc_canvas(patched)
 
-        self.lc_canvas.figure = fig
-        self.lc_canvas.update()
+        # Only a completed redraw may be skipped next time:
+        self.lc_fingerprint = fingerprint
 
     def refresh_dataset_panel(self):
-        row_data = []
-
-        for ds_label, ds_meta in self.dataset.datasets.items():
-            plot_data = False
-            plot_model = False
-
-            # phases string:
-            phase_min = ds_meta.get('phase_min')
-            phase_max = ds_meta.get('phase_max')
-            n_points = ds_meta.get('n_points')
-            phases_str = f'({phase_min:.2f}, {phase_max:.2f}, {n_points})'
-
-            row_data.append({
-                'label': ds_label,
-                'type': ds_meta['kind'],
-                'passband': ds_meta['passband'],
-                'filename': ds_meta['filename'],
-                'phases': phases_str,
-                'data_points': ds_meta['data_points'],
-                'plot_data': plot_data,
-                'plot_model': plot_model
-            })
+        rows = self.dataset.get_table_rows()
+        current = {row['label']: dict(row) for row in rows}
+
+        # Keep the options current so that a reconnecting client renders
+        # the same table; options are observable, so suspend the full table
+        # update that the assignment would otherwise send:
+        with self.dataset_table._props.suspend_updates():
+            self.dataset_table.options['rowData'] = rows
+
+        # The first refresh sends the whole table; later ones only send the
+        # rows that were added, changed or removed since the last refresh:
+        if self.dataset_table_rows is None:
+            self.dataset_table.update()
+        else:
+            transaction = {
+                'add': [row for label, row in current.items() if label not in self.dataset_table_rows],
+                'update': [row for label, row in current.items()
+                           if label in self.dataset_table_rows and self.dataset_table_rows[label] != row],
+                'remove': [{'label': label} for label in self.dataset_table_rows if label not in current]
+            }
+            if any(transaction.values()):
+                self.dataset_table.run_grid_method('applyTransaction', transaction)
+
+        self.dataset_table_rows = current
+
+    def schedule_dataset_panel_refresh(self):
+        """
+        Refresh the dataset panel on the next event loop iteration.
+
+        Multiple requests made before the refresh runs are coalesced into a
+        single table update.
+        """
+        if self.dataset_panel_refresh_scheduled:
+            return
+        self.dataset_panel_refresh_scheduled = True
+
+        def refresh():
+            self.dataset_panel_refresh_scheduled = False
+            self.refresh_dataset_panel()
+
+        ui.timer(0, refresh, once=True)
+
+    def get_example_files(self):
+        """
+        List the bundled example data files.
+
+        The examples directory does not change while the app is running, so
+        it is scanned once per process and the listing is shared by all
+        sessions.
+        """
+        if PhoebeUI._example_files is None:
+            example_files = []
 
-        self.dataset_table.options['rowData'] = row_data
-        self.dataset_table.update()
+            if _EXAMPLES_EXISTS:
+                for file_path in sorted(_EXAMPLES_DIR.iterdir()):
+                    if not file_path.is_file():
+                        continue
+                    example_files.append({
+                        'name': file_path.name,
+                        'path': str(file_path),
+                        'description': self._get_file_description(file_path.name),
+                    })
+
+            PhoebeUI._example_files = example_files
+
+        return PhoebeUI._example_files
+
+    def _get_file_description(self, filename):
+        return _FILE_DESCRIPTIONS.get(filename, 'Example data file')
 
     def create_dataset_dialog(self):
         with ui.dialog() as dialog, ui.card().classes('w-[800px] h-[600px]'):
@@ -936,18 +1337,7 @@ class PhoebeUI:
                     with ui.tab_panel(example_tab):
                         ui.label('Select an example data file:').classes('mb-2')
 
-                        # TODO: move example file location to a config file
-                        examples_dir = Path(__file__).parent.parent / 'examples'
-                        example_files = []
-
-                        if examples_dir.exists():
-                            for file_path in examples_dir.glob('*'):
-                                example_files.append({
-                                    'name': file_path.name,
-                                    'path': str(file_path),
-                                    'description': '',
-                                    # 'description': self._get_file_description(file_path.name)
-                                })
+                        example_files = self.get_example_files()
 
                         if example_files:
                             # Track selected file and cards for highlighting
@@ -1005,7 +1395,7 @@ class PhoebeUI:
 
             with ui.row().classes('gap-2 justify-end w-full'):
                 ui.button('Cancel', on_click=dialog.close).classes('bg-gray-500')
-                ui.button(
+                self.dataset_add_button = ui.button(
                     'Add',
                     icon='save',
                     on_click=self.on_dataset_dialog_add_button_clicked
@@ -1016,12 +1406,61 @@ class PhoebeUI:
     def on_dataset_dialog_file_uploaded(self, event):
         if event and event.name and event.content:
             self.data_file = event.name
-            self.data_content = event.content
+            # keep the raw bytes: the upload stream can only be read once, and
+            # numpy parses bytes without decoding them to str first
+            self.data_content = event.content.read()
             ui.notify(f'File uploaded: {self.data_file}', type='success')
         else:
             ui.notify('File upload failed.', type='error')
 
-    def on_dataset_dialog_add_button_clicked(self):
+    def load_data_file(self):
+        """
+        Parse the selected (or uploaded) observations file into an (N, 3)
+        array of times, observables and sigmas.
+
+        Example files are parsed once and cached by path and modification
+        time; cached arrays are shared between datasets and thus read-only.
+        """
+        if self.data_content:
+            return self.parse_data_file(io.BytesIO(self.data_content))
+
+        key = (self.data_file, os.path.getmtime(self.data_file))
+        if key in self.data_cache:
+            self.data_cache.move_to_end(key)
+            return self.data_cache[key]
+
+        data = self.parse_data_file(self.data_file)
+        data.flags.writeable = False
+
+        self.data_cache[key] = data
+        if len(self.data_cache) > DATA_CACHE_SIZE:
+            self.data_cache.popitem(last=False)
+
+        return data
+
+    def parse_data_file(self, source):
+        """
+        Parse whitespace-separated observations from a path or binary file
+        object into an (N, 3) float64 array.
+
+        Only the three used columns are read, into a single buffer; column
+        slices taken from it are views, so no per-column copies are made.
+        Lines starting with '#' are comments. Rows are tokenized by pandas'
+        C parser when pandas is installed, and by np.loadtxt otherwise;
+        both parse the values exactly. Files on disk are memory-mapped by
+        pandas, so the parser walks the page cache instead of a copy of the
+        file; np.loadtxt reads them in chunks.
+        """
+        if pd is not None:
+            return pd.read_csv(
+                source, sep=r'\s+', comment='#', header=None, usecols=[0, 1, 2],
+                dtype=np.float64, engine='c', float_precision='round_trip',
+                memory_map=isinstance(source, (str, os.PathLike))
+            ).to_numpy()
+
+        return np.loadtxt(source, comments='#', usecols=(0, 1, 2), ndmin=2)
+
+    async def on_dataset_dialog_add_button_clicked(self):
         param_to_widget = {
             'kind': 'dataset_kind',
             'dataset': 'dataset_label',
@@ -1047,32 +1486,49 @@ class PhoebeUI:
             if widget and widget in self.widgets:
                 model[param] = self.widgets[widget].value
 
-        # Handle observational data if available
-        if self.data_file:
-            if self.data_content:
-                data_content = np.genfromtxt(self.data_content)
+        try:
+            # Show button loading indicator
+            self.dataset_add_button.props('loading')
+
+            # Handle observational data if available; parsing and the api
+            # calls below are blocking, so run them off the event loop
+            if self.data_file:
+                data_content = await get_event_loop().run_in_executor(
+                    None, self.load_data_file
+                )
+
+                model['filename'] = self.data_file
+                model['times'] = data_content[:, 0]
+                if kind == 'lc':
+                    model['fluxes'] = data_content[:, 1]
+                if kind == 'rv':
+                    # TODO: fix this.
+                    model['rv1s'] = data_content[:, 1]
+                    model['rv2s'] = data_content[:, 1]
+                model['sigmas'] = data_content[:, 2]
             else:
-                data_content = np.genfromtxt(self.data_file)
-
-            model['filename'] = self.data_file
-            model['data_points'] = len(data_content)
-            model['times'] = data_content[:, 0]
-            if kind == 'lc':
-                model['fluxes'] = data_content[:, 1]
-            if kind == 'rv':
-                # TODO: fix this.
-                model['rv1s'] = data_content[:, 1]
-                model['rv2s'] = data_content[:, 1]
-            model['sigmas'] = data_content[:, 2]
-        else:
-            model['filename'] = 'Synthetic'
+                model['filename'] = 'Synthetic'
 
-        try:
+            # Register the dataset here, on the event loop that also reads
+            # the datasets; only the blocking api calls run in the executor:
             self.dataset.add(**model)
+            try:
+                await get_event_loop().run_in_executor(
+                    None, partial(self.dataset.push, model['dataset'])
+                )
+            except Exception:
+                self.dataset.discard(model['dataset'])
+                raise
         except Exception as e:
+            # nothing was added, so there is nothing to refresh; keep the
+            # dialog open so the input can be corrected
             ui.notify(f'Error adding dataset: {e}', type='error')
+            return
+        finally:
+            # Remove button loading indicator
+            self.dataset_add_button.props(remove='loading')
 
-        self.refresh_dataset_panel()
+        self.schedule_dataset_panel_refresh()
 
         self.dataset_dialog.close()
 
@@ -1109,7 +1565,7 @@ class PhoebeUI:
 
     def on_dataset_remove_confirmed(self, dataset, dialog):
         self.dataset.remove(dataset)
-        self.refresh_dataset_panel()
+        self.schedule_dataset_panel_refresh()
         dialog.close()
 
     def on_dataset_panel_checkbox_toggled(self, event):
@@ -1117,7 +1573,17 @@ class PhoebeUI:
         field = event.args['colId']
         state = event.args['value']
 
-        self.dataset.datasets[dataset][field] = state
+        try:
+            self.dataset.set_plot_flag(dataset, field, state)
+        except ValueError as e:
+            ui.notify(str(e), type='warning')
+            # revert just the edited row:
+            self.dataset_table.run_grid_method('applyTransaction', {'update': [self.dataset.table_rows[dataset]]})
+            return
+
+        # the table already shows the new state:
+        if self.dataset_table_rows is not None and dataset in self.dataset_table_rows:
+            self.dataset_table_rows[dataset][field] = state
 
     def on_dataset_row_selected(self, event):
         # Selected dataset needs to be kept in the class as an attribute
@@ -1229,7 +1695,7 @@ class PhoebeUI:
 
         # Close dialog and show main UI
         self.startup_dialog.close()
-        self.main_splitter.style('display: flex')
+        self.main_splitter.style('visibility: visible')
 
         ui.notify(f'Welcome {first_name} {last_name}! Session {self.client_id} ready.', type='positive')
 
@@ -1249,51 +1715,103 @@ class PhoebeUI:
 
     def on_ephemeris_changed(self, param_name=None, param_value=None):
         """Handle changes to ephemeris parameters (t0, period) and update phase plot."""
-        # Only replot if we're currently showing phase on x-axis or if there's any data to plot
-        if self.widgets['lc_plot_x_axis'].value == 'phase' or any(
-            ds_meta.get('plot_data', False) or ds_meta.get('plot_model', False)
-            for ds_meta in self.dataset.datasets.values() if ds_meta['kind'] == 'lc'
+        # A morphology change re-sends t0 and period unchanged (from the
+        # executor), there is nothing to replot:
+        if self._updating_morphology:
+            return
+
+        # t0 and period often change together (each input is debounced on
+        # its own); restart a short timer so that they cause a single replot:
+        if self.ephemeris_timer is not None:
+            self.ephemeris_timer.cancel()
+        self.ephemeris_timer = ui.timer(DEBOUNCE_DELAY, self.replot_ephemeris, once=True)
+
+    def replot_ephemeris(self):
+        """Replot the light curve after the ephemeris changed."""
+        self.ephemeris_timer = None
+
+        # Only replot if a plotted trace depends on the ephemeris: models
+        # always do (their times are computed from phases), observations only
+        # when plotted against phase.
+        phase_axis = self.widgets['lc_plot_x_axis'].value == 'phase'
+        if any(
+            ds_meta['plot_model'] or (phase_axis and ds_meta['plot_data'])
+            for ds_meta in self.dataset.get_all_datasets().values() if ds_meta['kind'] == 'lc'
         ):
-            self.on_lc_plot_button_clicked()
+            self.on_lc_plot_button_clicked(ephemeris_changed=True)
 
-    def _on_morphology_change(self):
-        """Handle morphology selection change with confirmation dialog."""
-        new_morphology = self.morphology_select.value
+    def create_morphology_dialog(self):
+        """
+        Build the morphology change confirmation dialog.
 
-        # If it's the same as current, no need to warn
-        if new_morphology == self._current_morphology:
-            return
+        The dialog is built once and reused; _on_morphology_change only
+        updates its message and remembers the requested morphology.
+        """
+        self._pending_morphology = None
+
+        # Set while update_morphology pushes the parameter values to the new
+        # bundle; their change hooks are suppressed meanwhile:
+        self._updating_morphology = False
 
-        # Show confirmation dialog
         with ui.dialog() as dialog, ui.card():
             ui.label('Warning: Morphology Change').classes('text-lg font-bold mb-4')
-            morphology_msg = (f'Changing morphology from "{self._current_morphology}" '
-                              f'to "{new_morphology}" will affect the constraints between parameters.')
-            ui.label(morphology_msg)
+            self.morphology_msg_label = ui.label()
             ui.label('Do you want to continue?').classes('mb-4')
 
             with ui.row().classes('gap-4 justify-end w-full'):
-                ui.button('Cancel', on_click=lambda: self._cancel_morphology_change(dialog)).classes('bg-gray-500')
+                ui.button('Cancel', on_click=self._cancel_morphology_change).classes('bg-gray-500')
                 self.morph_confirm_btn = ui.button(
                     'Continue',
-                    on_click=lambda: self._confirm_morphology_change(dialog, new_morphology)
+                    on_click=self._confirm_morphology_change
                 )
                 self.morph_confirm_btn.classes('bg-red-500')
 
-        dialog.open()
+        return dialog
+
+    def _on_morphology_change(self):
+        """Handle morphology selection change with confirmation dialog."""
+        new_morphology = self.morphology_select.value
+
+        # If it's the same as current, no need to warn
+        if new_morphology == self._current_morphology:
+            return
+
+        # Show confirmation dialog
+        self._pending_morphology = new_morphology
+        self.morphology_msg_label.set_text(
+            f'Changing morphology from "{self._current_morphology}" '
+            f'to "{new_morphology}" will affect the constraints between parameters.'
+        )
+        self.morphology_dialog.open()
 
-    def _cancel_morphology_change(self, dialog):
+    def _cancel_morphology_change(self):
         """Cancel morphology change and revert selection."""
-        dialog.close()
+        self.morphology_dialog.close()
+        self._pending_morphology = None
         # Revert to previous morphology without triggering callback
         self.morphology_select.value = self._current_morphology
         ui.notify('Morphology change cancelled', type='info')
 
     def update_morphology(self, new_morphology):
+        """
+        Switch the bundle to `new_morphology` and re-send the UI state.
+
+        This runs in an executor, outside of any NiceGUI client context, so
+        it does not notify; it returns the error messages to show instead.
+        """
+        self._updating_morphology = True
+        try:
+            return self._update_morphology(new_morphology)
+        finally:
+            self._updating_morphology = False
+
+    def _update_morphology(self, new_morphology):
         # change morphology in the backend:
         self.phoebe_api.change_morphology(new_morphology)
 
         # cycle through all phoebe parameters defined in the UI:
+        errors = []
+        unconstrained = []
         for param_widget in self.parameters.values():
             # update parameter uniqueids:
             param_widget.update_uniqueid()
@@ -1303,55 +1821,90 @@ class PhoebeUI:
             if response['success']:
                 constrained = response['result']
                 param_widget.set_visible(not constrained)
+                if not constrained:
+                    unconstrained.append(param_widget)
             else:
-                ui.notify(f"Failed to check if parameter {param_widget.twig} is constrained", type='negative')
+                errors.append(f"Failed to check if parameter {param_widget.twig} is constrained")
 
-            # update the value:
-            if not constrained:
+        # Push the unconstrained values and readd all datasets in a single
+        # request instead of one round trip per parameter:
+        with self.phoebe_api.batch() as responses:
+            for param_widget in unconstrained:
                 param_widget.on_value_changed(event=False)
+            self.dataset.readd_all()
+
+        failed = sum(not response.get('success', False) for response in responses)
+        if failed:
+            errors.append(f'{failed} updates failed after the morphology change')
 
-        # Readd all datasets:
-        self.dataset.readd_all()
+        return errors
 
-    async def _confirm_morphology_change(self, dialog, new_morphology):
+    async def _confirm_morphology_change(self):
+        new_morphology = self._pending_morphology
         self.morph_confirm_btn.props('loading')
 
         try:
-            await get_event_loop().run_in_executor(
+            errors = await get_event_loop().run_in_executor(
                 None, self.update_morphology, new_morphology
             )
         finally:
             self.morph_confirm_btn.props(remove='loading')
 
-        dialog.close()
+        self._current_morphology = new_morphology
+        self._pending_morphology = None
+        self.morphology_dialog.close()
+
+        for error in errors:
+            ui.notify(error, type='negative')
 
         ui.notify(f'Morphology changed to {new_morphology}.', type='positive')
 
+    def flush_parameters(self):
+        """Send parameter values that are still waiting for their debounce timers."""
+        for parameter in self.parameters.values():
+            parameter.flush()
+
     async def compute_model(self):
         """Compute Phoebe model with current parameters."""
+        # While a model is being computed the button cancels it instead:
+        if self.compute_future is not None:
+            self.compute_future.cancel()
+            return
+
+        # The model must see the values the user has just typed:
+        self.flush_parameters()
+
         try:
-            # Show button loading indicator
-            self.compute_button.props('loading')
+            # Turn the button into a cancel button
+            self.compute_button.set_text('Cancel')
+            self.compute_button.props('icon=close')
 
             # Run the compute operation asynchronously to avoid blocking the UI
-            response = await get_event_loop().run_in_executor(
-                None, self.phoebe_api.run_compute
+            self.compute_future = get_event_loop().run_in_executor(
+                _COMPUTE_EXECUTOR, self.phoebe_api.run_compute
             )
+            try:
+                response = await self.compute_future
+            except CancelledError:
+                if not self.compute_future.cancelled():
+                    raise
+                # The request cannot be recalled from the server; its result
+                # is discarded when it arrives
+                ui.notify('Model computation cancelled.', type='warning')
+                return
 
             if response.get('success', False):
                 model_data = response.get('result', {}).get('model', {})
 
-                for ds_label, ds_meta in self.dataset.datasets.items():
-                    if ds_label in model_data:
-                        ds_data = model_data[ds_label]
-                        ds_meta['model_fluxes'] = ds_data.get('fluxes', [])
-                        ds_meta['model_rv1s'] = ds_data.get('rv1s', [])
-                        ds_meta['model_rv2s'] = ds_data.get('rv2s', [])
-                    else:
-                        ds_meta['model_fluxes'] = []
-                        ds_meta['model_rv1s'] = []
-                        ds_meta['model_rv2s'] = []
-                
+                for ds_label in self.dataset.datasets:
+                    ds_data = model_data.get(ds_label, {})
+                    self.dataset.set_model(
+                        ds_label,
+                        fluxes=ds_data.get('fluxes', []),
+                        rv1s=ds_data.get('rv1s', []),
+                        rv2s=ds_data.get('rv2s', [])
+                    )
+
                 ui.notify('Model computed successfully!', type='positive')
             else:
                 ui.notify(f"Model computation failed: {response.get('error', 'Unknown error')}", type='negative')
@@ -1359,8 +1912,10 @@ class PhoebeUI:
         except Exception as e:
             ui.notify(f"Error computing model: {str(e)}", type='negative')
         finally:
-            # Remove button loading indicator
-            self.compute_button.props(remove='loading')
+            # Restore the compute button
+            self.compute_future = None
+            self.compute_button.set_text('Compute Model')
+            self.compute_button.props('icon=calculate')
 
     async def run_solver(self):
         fit_parameters = [twig for twig, parameter in self.parameters.items() if hasattr(parameter, 'adjust') and parameter.adjust]
@@ -1370,16 +1925,28 @@ class PhoebeUI:
 
         steps = [self.parameters[twig].step for twig in fit_parameters]
 
-        self.phoebe_api.set_value(twig='fit_parameters@solver', value=fit_parameters)
-        self.phoebe_api.set_value(twig='steps@solver', value=steps)
+        # The solver must start from the values the user has just typed:
+        self.flush_parameters()
 
         try:
+            # Both solver options are set in a single round-trip:
+            with self.phoebe_api.batch() as responses:
+                self.phoebe_api.set_value(twig='fit_parameters@solver', value=fit_parameters)
+                self.phoebe_api.set_value(twig='steps@solver', value=steps)
+
+            # don't run the solver with stale options:
+            failed = [response for response in responses if not response.get('success', False)]
+            if failed:
+                for response in failed:
+                    ui.notify(f"Failed to set up the solver: {response.get('error', 'Unknown error')}", type='negative')
+                return
+
             # Show button loading indicator
             self.fit_button.props('loading')
 
             # Run the compute operation asynchronously to avoid blocking the UI
             response = await get_event_loop().run_in_executor(
-                None, self.phoebe_api.run_solver
+                _COMPUTE_EXECUTOR, self.phoebe_api.run_solver
             )
 
             if response.get('success', False):
@@ -1515,6 +2082,9 @@ class PhoebeUI:
 
 
 if __name__ in {"__main__", "__mp_main__"}:
+    # Compile numeric transforms before the first plot is requested
+    jit_warmup()
+
     # Initialize API clients
     session_api = SessionAPI(base_url="http://localhost:8001")
     phoebe_api = PhoebeAPI(base_url="http://localhost:8001")
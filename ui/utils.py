@@ -1,13 +1,165 @@
 """
 Utility functions for astronomical calculations and data transformations.
+
+The array transforms used on every plot refresh are compiled with numba
+when it is installed; without numba the same functions run as plain numpy.
 """
+import base64
+import functools
+
 import numpy as np
 
+try:
+    from numba import njit, prange, vectorize
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function uncompiled."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    def vectorize(*args, **kwargs):
+        """Stand-in for numba.vectorize; the kernels are numpy-compatible."""
+        def decorator(func):
+            @functools.wraps(func)
+            def ufunc(*args, out=None):
+                if out is None:
+                    return func(*args)
+                out[...] = func(*args)
+                return out
+            return ufunc
+        return decorator
+
+
+# Conversion factor between flux and magnitude errors, 2.5 / ln(10):
+_MAG_ERROR_SCALE = 2.5 / np.log(10)
+
+# Arrays with at least this many elements are folded on all cores; smaller
+# ones do not amortize the thread pool overhead:
+_PARALLEL_MIN_SIZE = 100_000
+
+
+# Element-wise kernels are compiled to numpy ufuncs, so they broadcast,
+# accept scalars and keep float32 inputs in float32.
+
+@vectorize(['float64(float64, float64, float64)'], cache=True)
+def _time_to_phase(time, period, t0):
+    phase = ((time - t0) % period) / period
+    # Convert from [0, 1] to [-0.5, 0.5]
+    return phase - (phase > 0.5)
+
+
+@njit(parallel=True, cache=True)
+def _time_to_phase_parallel(time, period, t0, out):
+    for i in prange(time.size):
+        phase = ((time[i] - t0) % period) / period
+        out[i] = phase - (phase > 0.5)
+
+
+@vectorize(['float64(float64, float64)'], cache=True)
+def _shift_phase(phase, shift):
+    phase = phase - shift
+    # Wrap back into [-0.5, 0.5], matching _time_to_phase at the edges
+    return phase - np.ceil(phase - 0.5)
+
+
+@njit(cache=True)
+def _alias_data(data, extend_range):
+    # Model phase grids come sorted; folded observations are sorted here,
+    # on the N input rows instead of the aliased output:
+    phase = data[:, 0]
+    if not np.all(phase[1:] >= phase[:-1]):
+        data = data[np.argsort(phase)]
+        phase = data[:, 0]
+
+    n = data.shape[0]
+
+    # Edge blocks as index ranges of the sorted data
+    left_start = np.searchsorted(phase, -0.5, side='left')
+    left_end = np.searchsorted(phase, -0.5 + extend_range, side='left')
+    right_start = np.searchsorted(phase, 0.5 - extend_range, side='right')
+    right_end = np.searchsorted(phase, 0.5, side='right')
+    n_left = left_end - left_start
+    n_right = right_end - right_start
+
+    aliased = np.empty((n_right + n + n_left, data.shape[1]), dtype=data.dtype)
+
+    # Copy right edge to left extension
+    aliased[:n_right] = data[right_start:right_end]
+    aliased[:n_right, 0] -= 1.0  # e.g., 0.45 -> -0.55
+
+    # Original data
+    aliased[n_right:n_right + n] = data
+
+    # Copy left edge to right extension
+    aliased[n_right + n:] = data[left_start:left_end]
+    aliased[n_right + n:, 0] += 1.0  # e.g., -0.45 -> 0.55
+
+    # The three blocks are sorted and in order as long as the data stay
+    # within [-0.5, 0.5]; phase ranges extending beyond need a full sort
+    if n > 0 and (phase[0] < -0.5 or phase[-1] > 0.5):
+        return aliased[np.argsort(aliased[:, 0])]
+
+    return aliased
+
+
+@vectorize(['float32(float32, float32)', 'float64(float64, float64)'], cache=True)
+def _flux_to_magnitude(flux, zero_point):
+    return -2.5 * np.log10(flux) + zero_point
+
+
+@vectorize(['float32(float32, float32)', 'float64(float64, float64)'], cache=True)
+def _magnitude_to_flux(magnitude, zero_point):
+    return 10**(-0.4 * (magnitude - zero_point))
 
-def time_to_phase(time, period, t0=0.0):
+
+@vectorize(['float32(float32, float32)', 'float64(float64, float64)'], cache=True)
+def _magnitude_error_to_flux_error(flux, mag_error):
+    return flux * mag_error / _MAG_ERROR_SCALE
+
+
+@vectorize(['float32(float32, float32)', 'float64(float64, float64)'], cache=True)
+def _flux_error_to_magnitude_error(flux, flux_error):
+    return _MAG_ERROR_SCALE * flux_error / flux
+
+
+# numpy error model: zero or NaN fluxes give inf/NaN like the ufuncs instead
+# of raising ZeroDivisionError
+@njit(cache=True, error_model='numpy')
+def _flux_to_magnitude_with_error(flux, flux_error, zero_point, magnitude, magnitude_error):
+    # One pass over the fluxes for both outputs
+    for i in range(flux.size):
+        f = flux[i]
+        magnitude[i] = -2.5 * np.log10(f) + zero_point
+        magnitude_error[i] = _MAG_ERROR_SCALE * flux_error[i] / f
+
+
+def jit_warmup():
+    """
+    Compile (or load from cache) the numba-compiled transforms ahead of the
+    first plot, so that the first redraw does not pay the compilation cost.
+    """
+    time_to_phase(np.zeros(1), 1.0, 0.0)
+    if HAVE_NUMBA:
+        _time_to_phase_parallel(np.zeros(1), 1.0, 0.0, np.zeros(1))
+    shift_phase(np.zeros(1), 1.0, 0.0)
+    alias_data(np.zeros((1, 2)))
+    flux_to_magnitude(np.ones(1))
+    flux_to_magnitude_with_error(np.ones(1), np.ones(1))
+    flux_to_magnitude_with_error(np.ones(1, dtype=np.float32), np.ones(1, dtype=np.float32))
+    magnitude_to_flux(np.zeros(1))
+
+
+def time_to_phase(time, period, t0=0.0, out=None):
     """
     Convert time to orbital phase in the range [-0.5, 0.5].
 
+    With numba, large arrays are folded in parallel.
+
     Parameters:
     -----------
     time : array-like
@@ -16,41 +168,73 @@ def time_to_phase(time, period, t0=0.0):
         Orbital period in same units as time
     t0 : float, optional
         Reference time (epoch), default is 0.0
+    out : array-like, optional
+        Array the result is written to, default is a new array
 
     Returns:
     --------
     array-like
         Phase values in range [-0.5, 0.5]
     """
-    phase = ((time - t0) % period) / period
-    # Convert from [0, 1] to [-0.5, 0.5]
-    phase = np.where(phase > 0.5, phase - 1.0, phase)
-    return phase
+    if HAVE_NUMBA and np.size(time) >= _PARALLEL_MIN_SIZE and (
+            out is None or (out.dtype == np.float64 and out.flags.c_contiguous)):
+        time = np.ascontiguousarray(time, dtype=np.float64)
+        if out is None:
+            out = np.empty_like(time)
+        _time_to_phase_parallel(time.ravel(), float(period), float(t0), out.ravel())
+        return out
 
+    return _time_to_phase(time, period, t0, out=out)
 
-def alias_data(data, extend_range=0.1):
-    phase = data[:, 0]
-    mask_left = (phase >= -0.5) & (phase < -0.5 + extend_range)
-    mask_right = (phase > 0.5 - extend_range) & (phase <= 0.5)
 
-    # Copy left edge to right extension
-    left_copied = data[mask_left].copy()
-    left_copied[:, 0] = left_copied[:, 0] + 1.0  # e.g., -0.45 -> 0.55
+def shift_phase(phase, period, dt0):
+    """
+    Re-fold phases after the reference time moved by `dt0`.
 
-    # Copy right edge to left extension
-    right_copied = data[mask_right].copy()
-    right_copied[:, 0] = right_copied[:, 0] - 1.0  # e.g., 0.45 -> -0.55
+    Equivalent to time_to_phase(time, period, t0 + dt0) for phases folded
+    with time_to_phase(time, period, t0), but without the modulo over the
+    (large) time values.
 
-    # Concatenate original and aliased data
-    aliased = np.concatenate([data, left_copied, right_copied], axis=0)
+    Parameters:
+    -----------
+    phase : array-like
+        Phase values in range [-0.5, 0.5]
+    period : float
+        Orbital period in same units as time
+    dt0 : float
+        Change of the reference time (epoch)
 
-    # Optionally, sort by phase
-    aliased = aliased[np.argsort(aliased[:, 0])]
+    Returns:
+    --------
+    array-like
+        Phase values in range [-0.5, 0.5]
+    """
+    return _shift_phase(phase, dt0 / period)
 
-    return aliased
 
+def alias_data(data, extend_range=0.1):
+    """
+    Extend phased data beyond [-0.5, 0.5] for plotting.
+
+    Rows within `extend_range` of either phase edge are copied to the other
+    side (shifted by one full phase), and the result is sorted by phase.
 
-def flux_to_magnitude(flux, zero_point=0.0):
+    Parameters:
+    -----------
+    data : array-like
+        2-D array whose first column is phase
+    extend_range : float, optional
+        Phase span copied past each edge, default is 0.1
+
+    Returns:
+    --------
+    array-like
+        Aliased data, sorted by phase
+    """
+    return _alias_data(np.asarray(data), float(extend_range))
+
+
+def flux_to_magnitude(flux, zero_point=0.0, out=None):
     """
     Convert flux to magnitude.
 
@@ -60,16 +244,53 @@ def flux_to_magnitude(flux, zero_point=0.0):
         Flux values
     zero_point : float, optional
         Magnitude zero point, default is 0.0
+    out : array-like, optional
+        Array the result is written to, default is a new array
 
     Returns:
     --------
     array-like
         Magnitude values
     """
-    return -2.5 * np.log10(flux) + zero_point
+    return _flux_to_magnitude(flux, zero_point, out=out)
 
 
-def magnitude_to_flux(magnitude, zero_point=0.0):
+def flux_to_magnitude_with_error(flux, flux_error, zero_point=0.0):
+    """
+    Convert flux and flux error to magnitude and magnitude error.
+
+    Equivalent to flux_to_magnitude() and flux_error_to_magnitude_error(),
+    but with numba both are computed in a single pass over the data.
+
+    Parameters:
+    -----------
+    flux : array-like
+        Flux values
+    flux_error : array-like
+        Flux error values
+    zero_point : float, optional
+        Magnitude zero point, default is 0.0
+
+    Returns:
+    --------
+    tuple of array-like
+        Magnitude values and magnitude error values
+    """
+    if not HAVE_NUMBA:
+        return flux_to_magnitude(flux, zero_point), flux_error_to_magnitude_error(flux, flux_error)
+
+    flux = np.ascontiguousarray(flux)
+    flux_error = np.ascontiguousarray(flux_error)
+    dtype = np.result_type(flux, flux_error, np.float32)
+
+    magnitude = np.empty(flux.shape, dtype=dtype)
+    magnitude_error = np.empty(flux.shape, dtype=dtype)
+    _flux_to_magnitude_with_error(flux.ravel(), flux_error.ravel(), zero_point, magnitude.ravel(), magnitude_error.ravel())
+
+    return magnitude, magnitude_error
+
+
+def magnitude_to_flux(magnitude, zero_point=0.0, out=None):
     """
     Convert magnitude to flux.
 
@@ -79,16 +300,18 @@ def magnitude_to_flux(magnitude, zero_point=0.0):
         Magnitude values
     zero_point : float, optional
         Magnitude zero point, default is 0.0
+    out : array-like, optional
+        Array the result is written to, default is a new array
 
     Returns:
     --------
     array-like
         Flux values
     """
-    return 10**(-0.4 * (magnitude - zero_point))
+    return _magnitude_to_flux(magnitude, zero_point, out=out)
 
 
-def magnitude_error_to_flux_error(flux, mag_error):
+def magnitude_error_to_flux_error(flux, mag_error, out=None):
     """
     Convert magnitude error to flux error.
 
@@ -98,10 +321,105 @@ def magnitude_error_to_flux_error(flux, mag_error):
         Flux values
     mag_error : array-like
         Magnitude error values
+    out : array-like, optional
+        Array the result is written to, default is a new array
 
     Returns:
     --------
     array-like
         Flux error values
     """
-    return flux * mag_error * np.log(10) / 2.5
+    return _magnitude_error_to_flux_error(flux, mag_error, out=out)
+
+
+def flux_error_to_magnitude_error(flux, flux_error, out=None):
+    """
+    Convert flux error to magnitude error.
+
+    Parameters:
+    -----------
+    flux : array-like
+        Flux values
+    flux_error : array-like
+        Flux error values
+    out : array-like, optional
+        Array the result is written to, default is a new array
+
+    Returns:
+    --------
+    array-like
+        Magnitude error values
+    """
+    return _flux_error_to_magnitude_error(flux, flux_error, out=out)
+
+
+def downsample_indices(values, max_points):
+    """
+    Select at most `max_points` indices of `values` that preserve their
+    visual envelope (min/max decimation).
+
+    The values are split into equal buckets and the positions of the minimum
+    and the maximum of each bucket are kept, so narrow features such as
+    eclipses survive downsampling, unlike with a plain stride. Values should
+    be ordered by their abscissa (time or phase).
+
+    Parameters:
+    -----------
+    values : array-like
+        Values to downsample (e.g., fluxes)
+    max_points : int
+        Maximum number of indices returned
+
+    Returns:
+    --------
+    array-like
+        Sorted indices of the retained values
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+
+    # Two points per bucket; the remainder that does not fill a bucket
+    # contributes its own min/max pair:
+    n_buckets = (max_points - 2) // 2
+    bucket_size = n // n_buckets
+    buckets = values[:n_buckets * bucket_size].reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+
+    indices = [offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1)]
+    if n > n_buckets * bucket_size:
+        remainder = values[n_buckets * bucket_size:]
+        indices.append(n_buckets * bucket_size + np.array([remainder.argmin(), remainder.argmax()]))
+
+    return np.unique(np.concatenate(indices))
+
+
+def to_typed_array(values):
+    """
+    Encode a numeric array as a Plotly typed array.
+
+    Plotly.js decodes base64-encoded little-endian buffers (`bdata`) into
+    typed arrays, which is both smaller on the wire and faster to parse
+    than a JSON list of decimal numbers. Values that are not 1-D float32 or
+    float64 arrays are returned unchanged.
+
+    Parameters:
+    -----------
+    values : array-like
+        Array to encode
+
+    Returns:
+    --------
+    dict or array-like
+        {'dtype': ..., 'bdata': ...} typed array spec
+    """
+    array = np.asarray(values) if isinstance(values, (list, tuple, np.ndarray)) else None
+    if array is None or array.ndim != 1 or array.dtype.kind != 'f' or array.dtype.itemsize not in (4, 8):
+        return values
+
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+    return {
+        'dtype': f'{array.dtype.kind}{array.dtype.itemsize}',
+        'bdata': base64.b64encode(array.tobytes()).decode('ascii')
+    }